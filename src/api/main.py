@@ -1,12 +1,55 @@
-from fastapi import FastAPI, HTTPException
+import os
+from contextlib import asynccontextmanager
+import uvicorn
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import AsyncIterator, List, Optional
 from pydantic import BaseModel
+from src.config.db_connection import init_pool
+from src.config.logging_config import setup_logging
 from src.database.queries import RecipeRepository
 from src.models.recipe import Recipe
 from src.recommender.recipe_recommender import EnhancedRecipeRecommender, UserPreferences
 
-app = FastAPI(title="Recipe Manager API")
+# Worker processes started by __main__. Every worker opens its own pool and
+# builds its own recommender, so keep this modest
+API_WORKERS = int(os.environ.get("API_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Connections all workers together may hold; stays under Postgres' default
+# max_connections=100 with room left for the scraper and admin sessions
+DB_MAX_CONNECTIONS = int(os.environ.get("DB_MAX_CONNECTIONS", 80))
+
+# Per-worker pool sizes, splitting DB_MAX_CONNECTIONS across the workers
+POOL_MAX_SIZE = max(1, DB_MAX_CONNECTIONS // API_WORKERS)
+POOL_MIN_SIZE = min(5, POOL_MAX_SIZE)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the connection pool, repositories and recommender for the app's lifetime.
+    
+    Runs once in every worker process, so each worker owns its own pool.
+    """
+    teardown_logging = setup_logging()
+    try:
+        app.state.pool = await init_pool(min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE)
+        try:
+            app.state.recipe_repo = RecipeRepository(app.state.pool)
+            app.state.recommender = EnhancedRecipeRecommender(app.state.recipe_repo)
+            await app.state.recommender.initialize_ingredient_vectors()
+            yield
+        finally:
+            await app.state.pool.close()
+    finally:
+        # Flush records still waiting in the queue and detach the queue handler
+        teardown_logging()
+
+app = FastAPI(
+    title="Recipe Manager API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -17,9 +60,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize repositories and recommender
-recipe_repo = RecipeRepository()
-recommender = EnhancedRecipeRecommender(recipe_repo)
+# Dependencies resolving the objects created in lifespan
+def get_recipe_repo(request: Request) -> RecipeRepository:
+    return request.app.state.recipe_repo
+
+def get_recommender(request: Request) -> EnhancedRecipeRecommender:
+    return request.app.state.recommender
 
 # Pydantic models for recommendation endpoint
 class RecommendationRequest(BaseModel):
@@ -42,53 +88,131 @@ class RecipeRecommendation(BaseModel):
 class RecommendationResponse(BaseModel):
     recommendations: List[RecipeRecommendation]
 
+# Upper bound on IDs accepted by the batch endpoint
+MAX_BATCH_SIZE = 100
+
+# Largest /recipes page served from the page cache; bigger pages are streamed
+MAX_CACHED_PAGE_SIZE = 100
+
+class BatchRequest(BaseModel):
+    ids: List[int]
+
+async def _json_array(documents: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Wrap a stream of JSON documents into a single streamed JSON array"""
+    yield "["
+    separator = ""
+    async for document in documents:
+        yield separator + document
+        separator = ","
+    yield "]"
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak If-None-Match comparison (RFC 9110): W/ prefixes are ignored and *
+    matches anything, since proxies that compress responses weaken the ETag.
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
 # Existing endpoints
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Recipe Manager API"}
 
 @app.get("/recipes", response_model=List[dict])
-async def get_recipes(skip: int = 0, limit: int = 10):
-    """Get a list of recipes with pagination"""
+async def get_recipes(
+    request: Request,
+    # Validated up front: once a large page starts streaming, a database error
+    # can no longer turn into an error response
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=0),
+    recipe_repo: RecipeRepository = Depends(get_recipe_repo)
+):
+    """
+    Get a list of recipes with pagination.
+    
+    Typical pages are served from the repository's page cache with an ETag, so
+    clients and intermediaries can revalidate with If-None-Match. Larger pages
+    are streamed as they come off a server-side cursor, so memory stays flat.
+    """
+    if limit <= MAX_CACHED_PAGE_SIZE:
+        try:
+            page_json, etag = await recipe_repo.get_recipes_page_json(limit=limit, offset=skip)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+        if _etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=page_json, media_type="application/json", headers=headers)
+    
+    return StreamingResponse(
+        _json_array(recipe_repo.iter_recipes_json(limit=limit, offset=skip)),
+        media_type="application/json"
+    )
+
+# Declared before /recipes/{recipe_id} so "search" is not parsed as a recipe ID
+@app.get("/recipes/search", response_model=List[dict])
+async def search_recipes(
+    query: Optional[str] = None,
+    max_prep_time: Optional[int] = None,
+    limit: int = 10,
+    recipe_repo: RecipeRepository = Depends(get_recipe_repo)
+):
+    """Search recipes by title and/or max prep time"""
     try:
-        recipes = recipe_repo.get_recipes(limit=limit, offset=skip)
+        recipes = await recipe_repo.search_recipes(
+            query=query,
+            max_prep_time=max_prep_time,
+            limit=limit
+        )
         return [recipe.to_dict() for recipe in recipes if recipe]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/recipes/{recipe_id}", response_model=dict)
-async def get_recipe(recipe_id: int):
+async def get_recipe(
+    recipe_id: int,
+    recipe_repo: RecipeRepository = Depends(get_recipe_repo)
+):
     """Get a specific recipe by ID"""
     try:
-        recipe = recipe_repo.get_recipe_by_id(recipe_id)
-        if recipe is None:
+        # The document is assembled by Postgres, so it is returned without re-serializing
+        recipe_json = await recipe_repo.get_recipe_json(recipe_id)
+        if recipe_json is None:
             raise HTTPException(status_code=404, detail="Recipe not found")
-        return recipe.to_dict()
+        return Response(content=recipe_json, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/recipes/search", response_model=List[dict])
-async def search_recipes(
-    query: Optional[str] = None,
-    max_prep_time: Optional[int] = None,
-    limit: int = 10
+@app.post("/recipes/batch", response_model=List[dict])
+async def get_recipes_batch(
+    request: BatchRequest,
+    recipe_repo: RecipeRepository = Depends(get_recipe_repo)
 ):
-    """Search recipes by title and/or max prep time"""
-    try:
-        recipes = recipe_repo.search_recipes(
-            query=query,
-            max_prep_time=max_prep_time,
-            limit=limit
+    """Get several recipes by ID in one request, in the order requested"""
+    if len(request.ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_SIZE} recipe IDs can be requested at once"
         )
-        return [recipe.to_dict() for recipe in recipes if recipe]
+    try:
+        recipes = await recipe_repo.get_recipes_by_ids(request.ids)
+        return [recipe.to_dict() for recipe in recipes]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # New recommendation endpoint
 @app.post("/recipes/recommend", response_model=RecommendationResponse)
-async def get_recipe_recommendations(request: RecommendationRequest):
+async def get_recipe_recommendations(
+    request: RecommendationRequest,
+    recommender: EnhancedRecipeRecommender = Depends(get_recommender)
+):
     """
     Get recipe recommendations based on user preferences.
     
@@ -138,4 +262,17 @@ async def get_recipe_recommendations(request: RecommendationRequest):
         return response_data
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+if __name__ == "__main__":
+    # uvloop and httptools replace the pure-Python event loop and HTTP parser;
+    # several worker processes sidestep the GIL
+    uvicorn.run(
+        "src.api.main:app",
+        # Local-only unless API_HOST opts in to other interfaces
+        host=os.environ.get("API_HOST", "127.0.0.1"),
+        port=int(os.environ.get("API_PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=API_WORKERS
+    )
\ No newline at end of file
@@ -1,18 +1,65 @@
-import psycopg2
+import atexit
+import logging
+from typing import Optional
+import asyncpg
+from psycopg2.pool import ThreadedConnectionPool
 from src.config.database_config import DatabaseConfig
 
-def get_connection():
-    """Create a new database connection"""
-    try:
-        return psycopg2.connect(
+logger = logging.getLogger(__name__)
+
+# Shared psycopg2 pool, created on first use so importing this module never connects
+_POOL: Optional[ThreadedConnectionPool] = None
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Return the module-level connection pool, creating it if needed"""
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadedConnectionPool(
+            minconn=5,
+            maxconn=50,
             host=DatabaseConfig.HOST,
             database=DatabaseConfig.DATABASE,
             user=DatabaseConfig.USER,
             password=DatabaseConfig.PASSWORD,
             port=DatabaseConfig.PORT
         )
-    except Exception as e:
-        print(f"Error connecting to database: {e}")
+    return _POOL
+
+def _close_pool():
+    """Close every pooled connection at interpreter exit"""
+    if _POOL is not None:
+        _POOL.closeall()
+
+atexit.register(_close_pool)
+
+def get_connection():
+    """Check out a database connection from the pool"""
+    try:
+        return _get_pool().getconn()
+    except Exception:
+        logger.exception("Error connecting to database")
+        raise
+
+async def init_pool(min_size: int = 10, max_size: int = 50) -> asyncpg.Pool:
+    """
+    Create the asyncpg connection pool used by the API
+    
+    Args:
+        min_size: Number of connections opened eagerly
+        max_size: Upper bound on concurrently open connections
+        
+    Returns:
+        asyncpg.Pool: The initialized connection pool
+    """
+    try:
+        return await asyncpg.create_pool(
+            DatabaseConfig.get_connection_string(),
+            min_size=min_size,
+            max_size=max_size,
+            max_inactive_connection_lifetime=300
+        )
+    except Exception:
+        logger.exception("Error creating database pool")
         raise
 
 def test_connection():
@@ -20,7 +67,7 @@ def test_connection():
     try:
         conn = get_connection()
         print("Successfully connected to the database!")
-        conn.close()
+        release_connection(conn)
         return True
     except Exception as e:
         print(f"Failed to connect to database: {e}")
@@ -28,16 +75,16 @@ def test_connection():
 
 def release_connection(conn):
     """
-    Properly close a database connection
+    Return a database connection to the pool
     
     Args:
-        conn: The database connection to close
+        conn: The database connection to release
     """
     if conn is not None:
         try:
-            conn.close()
-        except Exception as e:
-            print(f"Error closing database connection: {e}")
+            _get_pool().putconn(conn)
+        except Exception:
+            logger.exception("Error releasing database connection")
 
 if __name__ == "__main__":
     # You can run this file directly to test the connection
@@ -0,0 +1,38 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable
+
+def setup_logging(level: int = logging.INFO) -> Callable[[], None]:
+    """
+    Route log records through a queue drained by a background thread
+    
+    Logging calls only enqueue the record, so request handlers never wait on
+    the stderr lock or a synchronous flush.
+    
+    Args:
+        level: Minimum level for the root logger
+        
+    Returns:
+        Callable[[], None]: Teardown to call on shutdown; flushes pending records
+        and detaches the queue handler from the root logger
+    """
+    log_queue = queue.SimpleQueue()
+    
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    
+    root = logging.getLogger()
+    queue_handler = QueueHandler(log_queue)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    
+    listener.start()
+    
+    def teardown():
+        listener.stop()
+        # Nothing drains the queue once the listener stops
+        root.removeHandler(queue_handler)
+    
+    return teardown
@@ -1,8 +1,10 @@
-from mimetypes import init
+import logging
 import psycopg2
-from src.config.db_connection import get_connection
+from src.config.db_connection import get_connection, release_connection
 from src.config.database_config import DatabaseConfig
 
+logger = logging.getLogger(__name__)
+
 def create_database():
     """Create the recipe_manager database"""
     # Connect to default PostgreSQL database
@@ -22,11 +24,11 @@ def create_database():
         exists = cursor.fetchone()
         if not exists:
             cursor.execute('CREATE DATABASE recipe_manager')
-            print("Database created successfully!")
+            logger.info("Database created successfully!")
         else:
-            print("Database already exists.")
-    except Exception as e:
-        print(f"Error creating database: {e}")
+            logger.info("Database already exists.")
+    except Exception:
+        logger.exception("Error creating database")
     finally:
         cursor.close()
         conn.close()
@@ -59,6 +61,29 @@ def init_tables(connection):
             );
         """)
         
+        # Index the columns search_recipes filters on; the trigram index lets
+        # title ILIKE '%term%' use an index scan instead of a sequential scan
+        cursor.execute("""
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS idx_recipes_prep_time ON recipes (prep_time);
+            CREATE INDEX IF NOT EXISTS idx_recipes_title_trgm ON recipes USING gin (title gin_trgm_ops);
+        """)
+        
+        # Stored tsvector of the title for multi-word searches
+        cursor.execute("""
+            ALTER TABLE recipes ADD COLUMN IF NOT EXISTS title_tsv tsvector
+                GENERATED ALWAYS AS (to_tsvector('english', COALESCE(title, ''))) STORED;
+            CREATE INDEX IF NOT EXISTS idx_recipes_title_tsv ON recipes USING gin (title_tsv);
+        """)
+        
+        # Ingredient reads filter on recipe_id and order by section, id; this index
+        # serves both and covers the selected columns, avoiding sorts and heap fetches
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ingredients_recipe
+                ON ingredients (recipe_id, section, id)
+                INCLUDE (quantity, unit, name, additional);
+        """)
+        
         # Create trigger function
         cursor.execute("""
             CREATE OR REPLACE FUNCTION update_total_time()
@@ -86,5 +111,10 @@ def init_tables(connection):
         connection.commit()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     create_database()
-    init_tables(get_connection())
\ No newline at end of file
+    conn = get_connection()
+    try:
+        init_tables(conn)
+    finally:
+        release_connection(conn)
\ No newline at end of file
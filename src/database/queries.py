@@ -1,83 +1,246 @@
-from src.config.db_connection import get_connection, release_connection
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+import asyncpg
 from src.models.recipe import Recipe
 from src.models.ingredient import Ingredient
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of recipe JSON documents kept in the in-process lookup cache
+RECIPE_CACHE_SIZE = 2048
+
+# Number of recipe list pages cached, and for how long in seconds. Pages expire
+# because other processes (e.g. the scraper) insert without clearing this cache.
+PAGE_CACHE_SIZE = 256
+PAGE_CACHE_TTL = 60
+
+# Queries are kept as module constants so methods that run the same statement
+# share one definition and the SQL reads in one place
+SELECT_INGREDIENTS_BY_RECIPES = """
+    SELECT recipe_id, section, quantity, unit, name, additional
+    FROM ingredients
+    WHERE recipe_id = ANY($1::int[])
+    ORDER BY recipe_id, section, id
+"""
+
+SELECT_RECIPES_BY_IDS = """
+    SELECT id, title, url, prep_time, cook_time, total_time, servings
+    FROM recipes
+    WHERE id = ANY($1::int[])
+"""
+
+SELECT_RECIPE_PAGE = """
+    SELECT id, title, url, prep_time, cook_time, total_time, servings
+    FROM recipes
+    ORDER BY id
+    LIMIT $1 OFFSET $2
+"""
+
+# Builds the same shape as Recipe.to_dict() for a recipes row aliased as r, so
+# read-only endpoints can return Postgres' JSON text without building models.
+# json_* (rather than jsonb_*) keeps keys in to_dict() order.
+RECIPE_JSON = """
+    json_build_object(
+        'id', r.id,
+        'title', r.title,
+        'url', r.url,
+        'prep_time', r.prep_time,
+        'cook_time', r.cook_time,
+        'total_time', r.total_time,
+        'servings', r.servings,
+        'ingredients', COALESCE((
+            SELECT json_object_agg(s.section, s.items ORDER BY s.section)
+            FROM (
+                SELECT i.section, json_agg(json_build_object(
+                    'name', i.name,
+                    'quantity', i.quantity,
+                    'unit', i.unit,
+                    'additional', i.additional,
+                    'section', i.section
+                ) ORDER BY i.id) AS items
+                FROM ingredients i
+                WHERE i.recipe_id = r.id
+                GROUP BY i.section
+            ) s
+        ), '{}'::json),
+        'created_at', NULL
+    )
+"""
+
+SELECT_RECIPE_JSON_BY_ID = f"""
+    SELECT {RECIPE_JSON}
+    FROM recipes r
+    WHERE r.id = $1
+"""
+
+SELECT_RECIPE_JSON_PAGE = f"""
+    SELECT {RECIPE_JSON}
+    FROM recipes r
+    ORDER BY r.id
+    LIMIT $1 OFFSET $2
+"""
+
+SELECT_RECIPE_JSON_PAGE_ARRAY = f"""
+    SELECT COALESCE(json_agg(page.recipe ORDER BY page.id), '[]'::json)
+    FROM (
+        SELECT r.id, {RECIPE_JSON} AS recipe
+        FROM recipes r
+        ORDER BY r.id
+        LIMIT $1 OFFSET $2
+    ) page
+"""
+
+INSERT_INGREDIENT = """
+    INSERT INTO ingredients (recipe_id, section, quantity, unit, name, additional)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
+# Bulk inserts draw their ids from the recipes sequence up front so ingredient
+# rows can reference them without a round-trip per recipe
+RESERVE_RECIPE_IDS = """
+    SELECT nextval(pg_get_serial_sequence('recipes', 'id'))
+    FROM generate_series(1, $1)
+"""
+
+INSERT_RECIPE_WITH_ID = """
+    INSERT INTO recipes (id, title, url, prep_time, cook_time, servings)
+    VALUES ($1, $2, $3, $4, $5, $6)
+"""
+
+class _LRUCache:
+    """
+    Minimal bounded mapping that evicts the least recently used entry.
+    
+    Only touched from the event loop thread, so no locking is needed.
+    """
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize (int): Maximum number of entries kept
+            ttl (Optional[float]): Seconds an entry stays valid, or None to keep it until evicted
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Store value under key, evicting the oldest entry when full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached entry"""
+        self._data.clear()
 
 class RecipeRepository:
     """
     Repository class for handling all database operations related to recipes and ingredients.
     """
     
-    def get_recipe_by_id(self, recipe_id: int) -> Optional[Recipe]:
+    def __init__(self, pool: asyncpg.Pool):
         """
-        Retrieve a recipe and its ingredients by ID.
+        Args:
+            pool (asyncpg.Pool): Connection pool shared by all repository calls
+        """
+        self.pool = pool
+        self._recipe_json_cache = _LRUCache(RECIPE_CACHE_SIZE)
+        self._page_json_cache = _LRUCache(PAGE_CACHE_SIZE, ttl=PAGE_CACHE_TTL)
+    
+    def _invalidate_caches(self):
+        """Forget cached lookups after a write"""
+        self._recipe_json_cache.clear()
+        self._page_json_cache.clear()
+    
+    async def get_recipe_json(self, recipe_id: int) -> Optional[str]:
+        """
+        Retrieve a recipe and its ingredients as JSON text assembled by Postgres.
         
         Args:
             recipe_id (int): The ID of the recipe to retrieve
             
         Returns:
-            Optional[Recipe]: Recipe object if found, None otherwise
+            Optional[str]: JSON document shaped like Recipe.to_dict() if found, None otherwise
+        """
+        recipe_json = self._recipe_json_cache.get(recipe_id)
+        if recipe_json is None:
+            recipe_json = await self.pool.fetchval(SELECT_RECIPE_JSON_BY_ID, recipe_id)
+            if recipe_json is not None:
+                self._recipe_json_cache.put(recipe_id, recipe_json)
+        return recipe_json
+    
+    async def _fetch_ingredients(
+        self,
+        conn: asyncpg.Connection,
+        recipe_ids: List[int]
+    ) -> Dict[int, Dict[str, List[Ingredient]]]:
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        Fetch the ingredients of several recipes in a single query.
         
-        try:
-            # Get recipe details
-            cursor.execute("""
-                SELECT id, title, url, prep_time, cook_time, total_time, servings
-                FROM recipes
-                WHERE id = %s
-            """, (recipe_id,))
-            
-            recipe_data = cursor.fetchone()
-            if not recipe_data:
-                return None
-                
-            # Get all ingredients for this recipe
-            cursor.execute("""
-                SELECT section, quantity, unit, name, additional
-                FROM ingredients
-                WHERE recipe_id = %s
-                ORDER BY section, id
-            """, (recipe_id,))
-            
-            ingredients_data = cursor.fetchall()
+        Args:
+            conn (asyncpg.Connection): Connection to run the query on
+            recipe_ids (List[int]): IDs of the recipes to fetch ingredients for
             
-            # Organize ingredients by section
-            ingredients_dict = {}
-            for ing_data in ingredients_data:
-                section, quantity, unit, name, additional = ing_data
-                if section not in ingredients_dict:
-                    ingredients_dict[section] = []
-                    
-                ingredient = Ingredient(
-                    name=name,
-                    quantity=quantity,
-                    unit=unit,
-                    additional=additional,
-                    section=section
-                )
-                ingredients_dict[section].append(ingredient)
+        Returns:
+            Dict[int, Dict[str, List[Ingredient]]]: Ingredients grouped by recipe ID, then section
+        """
+        ingredients_data = await conn.fetch(SELECT_INGREDIENTS_BY_RECIPES, recipe_ids)
+        
+        ingredients_by_recipe = {}
+        for row in ingredients_data:
+            sections = ingredients_by_recipe.setdefault(row['recipe_id'], {})
+            sections.setdefault(row['section'], []).append(Ingredient(
+                name=row['name'],
+                quantity=row['quantity'],
+                unit=row['unit'],
+                additional=row['additional'],
+                section=row['section']
+            ))
+        return ingredients_by_recipe
+
+    async def _fetch_recipes(self, query: str, *params) -> List[Recipe]:
+        """
+        Run a query returning full recipe rows and attach their ingredients.
+        
+        Args:
+            query (str): SQL selecting id, title, url, prep_time, cook_time, total_time, servings
+            *params: Query parameters
             
-            # Create Recipe object
-            recipe = Recipe(
-                id=recipe_data[0],
-                title=recipe_data[1],
-                url=recipe_data[2],
-                prep_time=recipe_data[3],
-                cook_time=recipe_data[4],
-                total_time=recipe_data[5],
-                servings=recipe_data[6],
-                ingredients=ingredients_dict
+        Returns:
+            List[Recipe]: Recipe objects in the order returned by the query
+        """
+        async with self.pool.acquire() as conn:
+            recipe_rows = await conn.fetch(query, *params)
+            if not recipe_rows:
+                return []
+            ingredients_by_recipe = await self._fetch_ingredients(
+                conn, [row['id'] for row in recipe_rows]
             )
-            
-            return recipe
-            
-        finally:
-            cursor.close()
-            release_connection(conn)
+        
+        return [
+            Recipe(**row, ingredients=ingredients_by_recipe.get(row['id'], {}))
+            for row in recipe_rows
+        ]
 
-    def get_recipes(self, limit: int = 10, offset: int = 0) -> List[Recipe]:
+    async def get_recipes(self, limit: int = 10, offset: int = 0) -> List[Recipe]:
         """
         Retrieve a list of recipes with pagination.
         
@@ -88,34 +251,67 @@ class RecipeRepository:
         Returns:
             List[Recipe]: List of Recipe objects
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        return await self._fetch_recipes(SELECT_RECIPE_PAGE, limit, offset)
+
+    async def get_recipes_page_json(self, limit: int = 10, offset: int = 0) -> Tuple[str, str]:
+        """
+        Retrieve a page of recipes as a JSON array assembled by Postgres.
         
-        try:
-            # Get paginated recipe IDs
-            cursor.execute("""
-                SELECT id
-                FROM recipes
-                ORDER BY id
-                LIMIT %s OFFSET %s
-            """, (limit, offset))
+        Pages are cached, together with their ETag, for PAGE_CACHE_TTL seconds
+        or until this repository writes.
+        
+        Args:
+            limit (int): Maximum number of recipes to return
+            offset (int): Number of recipes to skip
             
-            recipe_ids = cursor.fetchall()
+        Returns:
+            Tuple[str, str]: JSON array of documents shaped like Recipe.to_dict(),
+            and its quoted ETag
+        """
+        page = self._page_json_cache.get((limit, offset))
+        if page is None:
+            page_json = await self.pool.fetchval(SELECT_RECIPE_JSON_PAGE_ARRAY, limit, offset)
+            page = (page_json, f'"{hashlib.sha1(page_json.encode()).hexdigest()}"')
+            self._page_json_cache.put((limit, offset), page)
+        return page
+
+    async def iter_recipes_json(self, limit: int = 10, offset: int = 0) -> AsyncIterator[str]:
+        """
+        Stream a page of recipes as JSON documents through a server-side cursor.
+        
+        A pooled connection is held until the iterator is exhausted or closed.
+        
+        Args:
+            limit (int): Maximum number of recipes to return
+            offset (int): Number of recipes to skip
             
-            # Fetch complete recipe data for each ID
-            recipes = []
-            for (recipe_id,) in recipe_ids:
-                recipe = self.get_recipe_by_id(recipe_id)
-                if recipe:
-                    recipes.append(recipe)
-                    
-            return recipes
+        Yields:
+            str: One JSON document per recipe, shaped like Recipe.to_dict()
+        """
+        async with self.pool.acquire() as conn:
+            # asyncpg cursors only exist inside a transaction
+            async with conn.transaction():
+                async for row in conn.cursor(SELECT_RECIPE_JSON_PAGE, limit, offset):
+                    yield row[0]
+
+    async def get_recipes_by_ids(self, recipe_ids: List[int]) -> List[Recipe]:
+        """
+        Retrieve several recipes by ID using one recipe query and one ingredient query.
+        
+        Args:
+            recipe_ids (List[int]): IDs of the recipes to retrieve
             
-        finally:
-            cursor.close()
-            release_connection(conn)
+        Returns:
+            List[Recipe]: Recipes in the order requested; unknown IDs are skipped
+        """
+        if not recipe_ids:
+            return []
+        
+        recipes = await self._fetch_recipes(SELECT_RECIPES_BY_IDS, list(set(recipe_ids)))
+        recipes_by_id = {recipe.id: recipe for recipe in recipes}
+        return [recipes_by_id[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes_by_id]
 
-    def search_recipes(
+    async def search_recipes(
         self,
         query: Optional[str] = None,
         max_prep_time: Optional[int] = None,
@@ -132,45 +328,35 @@ class RecipeRepository:
         Returns:
             List[Recipe]: List of matching Recipe objects
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        base_query = """
+            SELECT r.id, r.title, r.url, r.prep_time, r.cook_time, r.total_time, r.servings
+            FROM recipes r
+            WHERE 1=1
+        """
+        params = []
         
-        try:
-            base_query = """
-                SELECT DISTINCT r.id 
-                FROM recipes r
-                WHERE 1=1
-            """
-            params = []
-            
-            if query:
-                base_query += " AND r.title ILIKE %s"
+        if query:
+            terms = query.split()
+            if len(terms) > 1:
+                # Multi-word queries match stemmed words in any order via idx_recipes_title_tsv
+                params.append(' '.join(terms))
+                base_query += f" AND r.title_tsv @@ plainto_tsquery('english', ${len(params)})"
+            else:
+                # Substring match, served by the idx_recipes_title_trgm trigram index
                 params.append(f"%{query}%")
-            
-            if max_prep_time:
-                # Note: This assumes prep_time is stored in a format that can be converted to minutes
-                base_query += " AND REGEXP_REPLACE(r.prep_time, '[^0-9]', '', 'g')::integer <= %s"
-                params.append(max_prep_time)
-            
-            base_query += " LIMIT %s"
-            params.append(limit)
-            
-            cursor.execute(base_query, params)
-            recipe_ids = cursor.fetchall()
-            
-            return [
-                recipe
-                for recipe_id in recipe_ids
-                if recipe_id[0] is not None
-                for recipe in [self.get_recipe_by_id(recipe_id[0])]
-                if recipe is not None
-            ]
-            
-        finally:
-            cursor.close()
-            release_connection(conn)
+                base_query += f" AND r.title ILIKE ${len(params)}"
+        
+        if max_prep_time is not None:
+            # prep_time is stored as integer minutes, so this comparison can use idx_recipes_prep_time
+            params.append(max_prep_time)
+            base_query += f" AND r.prep_time <= ${len(params)}"
+        
+        params.append(limit)
+        base_query += f" LIMIT ${len(params)}"
+        
+        return await self._fetch_recipes(base_query, *params)
 
-    def insert_recipe(self, recipe_data: dict) -> Optional[int]:
+    async def insert_recipe(self, recipe_data: dict) -> Optional[int]:
         """
         Insert a new recipe and its ingredients into the database.
         
@@ -180,40 +366,28 @@ class RecipeRepository:
         Returns:
             Optional[int]: ID of the inserted recipe if successful, None otherwise
         """
-        conn = get_connection()
-        cursor = conn.cursor()
-
         try:
-            # Insert the recipe and get its ID - removed total_time from the INSERT
-            cursor.execute(
-                """
-                INSERT INTO recipes (title, url, prep_time, cook_time, servings)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id;
-                """,
-                (
-                    recipe_data['title'],
-                    recipe_data['url'],
-                    recipe_data['prep_time'],
-                    recipe_data['cook_time'],
-                    recipe_data['servings']
-                )
-            )
-            
-            result = cursor.fetchone()
-            if result is None:
-                raise Exception("No recipe ID returned from insert")
-                
-            recipe_id = result[0]
-
-            # Insert each ingredient associated with the recipe
-            for section, ingredients in recipe_data['ingredients'].items():
-                for ingredient in ingredients:
-                    cursor.execute(
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    # Insert the recipe and get its ID - removed total_time from the INSERT
+                    recipe_id = await conn.fetchval(
                         """
-                        INSERT INTO ingredients (recipe_id, section, quantity, unit, name, additional)
-                        VALUES (%s, %s, %s, %s, %s, %s)
+                        INSERT INTO recipes (title, url, prep_time, cook_time, servings)
+                        VALUES ($1, $2, $3, $4, $5)
+                        RETURNING id;
                         """,
+                        recipe_data['title'],
+                        recipe_data['url'],
+                        recipe_data['prep_time'],
+                        recipe_data['cook_time'],
+                        recipe_data['servings']
+                    )
+                    
+                    if recipe_id is None:
+                        raise Exception("No recipe ID returned from insert")
+
+                    # Insert all ingredients associated with the recipe in one batch
+                    rows = [
                         (
                             recipe_id,
                             section,
@@ -222,16 +396,71 @@ class RecipeRepository:
                             ingredient['name'],
                             ingredient['additional']
                         )
-                    )
+                        for section, ingredients in recipe_data['ingredients'].items()
+                        for ingredient in ingredients
+                    ]
+                    if rows:
+                        await conn.executemany(INSERT_INGREDIENT, rows)
 
-            conn.commit()
+            self._invalidate_caches()
             return recipe_id
 
-        except Exception as e:
-            print(f"Error inserting recipe and ingredients: {e}")
-            conn.rollback()
+        except Exception:
+            # The transaction context manager has already rolled back
+            logger.exception("Error inserting recipe and ingredients")
             return None
+
+    async def insert_recipes_bulk(self, recipes: List[dict]) -> Optional[List[int]]:
+        """
+        Insert several recipes and all their ingredients in a single transaction.
+        
+        Args:
+            recipes (List[dict]): Recipe dictionaries in the format taken by insert_recipe
             
-        finally:
-            cursor.close()
-            release_connection(conn)
\ No newline at end of file
+        Returns:
+            Optional[List[int]]: IDs of the inserted recipes in input order, or None
+            if the batch failed and nothing was inserted
+        """
+        if not recipes:
+            return []
+        
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    recipe_ids = [row[0] for row in await conn.fetch(RESERVE_RECIPE_IDS, len(recipes))]
+                    
+                    await conn.executemany(INSERT_RECIPE_WITH_ID, [
+                        (
+                            recipe_id,
+                            recipe_data['title'],
+                            recipe_data['url'],
+                            recipe_data['prep_time'],
+                            recipe_data['cook_time'],
+                            recipe_data['servings']
+                        )
+                        for recipe_id, recipe_data in zip(recipe_ids, recipes)
+                    ])
+                    
+                    rows = [
+                        (
+                            recipe_id,
+                            section,
+                            ingredient['quantity'],
+                            ingredient['unit'],
+                            ingredient['name'],
+                            ingredient['additional']
+                        )
+                        for recipe_id, recipe_data in zip(recipe_ids, recipes)
+                        for section, ingredients in recipe_data['ingredients'].items()
+                        for ingredient in ingredients
+                    ]
+                    if rows:
+                        await conn.executemany(INSERT_INGREDIENT, rows)
+
+            self._invalidate_caches()
+            return recipe_ids
+
+        except Exception:
+            # The transaction context manager has already rolled back
+            logger.exception("Error bulk inserting %d recipes", len(recipes))
+            return None
@@ -2,15 +2,17 @@ CREATE TABLE recipes (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255),
     url TEXT,
-    prep_time VARCHAR(50),
-    cook_time VARCHAR(50),
-    total_time VARCHAR(50),
+    prep_time INTEGER,
+    cook_time INTEGER,
+    total_time INTEGER,
     servings VARCHAR(10),
     cuisine_type VARCHAR(50),
     difficulty_level VARCHAR(20),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    user_id INTEGER REFERENCES users(id)
+    user_id INTEGER REFERENCES users(id),
+    -- Stored tsvector of the title for multi-word searches
+    title_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', COALESCE(title, ''))) STORED
 );
 
 -- User management
@@ -96,6 +98,12 @@ CREATE TABLE recipe_tag_mappings (
 );
 
 -- Create indexes for frequently accessed columns
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 CREATE INDEX idx_recipe_title ON recipes(title);
+CREATE INDEX idx_recipes_prep_time ON recipes(prep_time);
+CREATE INDEX idx_recipes_title_trgm ON recipes USING gin (title gin_trgm_ops);
+CREATE INDEX idx_recipes_title_tsv ON recipes USING gin (title_tsv);
+CREATE INDEX idx_ingredients_recipe ON ingredients (recipe_id, section, id)
+    INCLUDE (quantity, unit, name, additional);
 CREATE INDEX idx_ingredient_name ON ingredients(normalized_name);
 CREATE INDEX idx_user_email ON users(email);
\ No newline at end of file
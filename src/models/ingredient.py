@@ -1,23 +1,27 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Ingredient:
     name: str
     quantity: str
     unit: str
     additional: str = ""
     section: str = "main"
+    # Memoized to_dict() result; ingredients are not mutated after construction
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> dict:
-        return {
-            "name": self.name,
-            "quantity": self.quantity,
-            "unit": self.unit,
-            "additional": self.additional,
-            "section": self.section
-        }
+        if self._dict is None:
+            self._dict = {
+                "name": self.name,
+                "quantity": self.quantity,
+                "unit": self.unit,
+                "additional": self.additional,
+                "section": self.section
+            }
+        return self._dict
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Ingredient':
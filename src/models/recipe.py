@@ -1,9 +1,9 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional
 from datetime import datetime
 from src.models.ingredient import Ingredient
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     title: str
     url: Optional[str]
@@ -14,22 +14,39 @@ class Recipe:
     ingredients: Dict[str, List[Ingredient]]
     id: Optional[int] = None
     created_at: Optional[datetime] = None
+    # Memoized to_dict() result; recipes are not mutated after construction
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    # Memoized ingredient_name_set; cached_property needs an instance __dict__, which slots rule out
+    _ingredient_names: Optional[FrozenSet[str]] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def ingredient_name_set(self) -> FrozenSet[str]:
+        """Lowercase names of every ingredient across all sections"""
+        if self._ingredient_names is None:
+            self._ingredient_names = frozenset(
+                ingredient.name.lower()
+                for section in self.ingredients.values()
+                for ingredient in section
+            )
+        return self._ingredient_names
     
     def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "title": self.title,
-            "url": self.url,
-            "prep_time": self.prep_time,
-            "cook_time": self.cook_time,
-            "total_time": self.total_time,
-            "servings": self.servings,
-            "ingredients": {
-                section: [ing.to_dict() for ing in ingredients]
-                for section, ingredients in self.ingredients.items()
-            },
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
+        if self._dict is None:
+            self._dict = {
+                "id": self.id,
+                "title": self.title,
+                "url": self.url,
+                "prep_time": self.prep_time,
+                "cook_time": self.cook_time,
+                "total_time": self.total_time,
+                "servings": self.servings,
+                "ingredients": {
+                    section: [ing.to_dict() for ing in ingredients]
+                    for section, ingredients in self.ingredients.items()
+                },
+                "created_at": self.created_at.isoformat() if self.created_at else None
+            }
+        return self._dict
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Recipe':
@@ -1,18 +1,42 @@
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, FrozenSet, Optional
+import atexit
+import json
+import logging
+import os
 import numpy as np
 from dataclasses import dataclass
+from functools import lru_cache
+from scipy.sparse import csc_matrix, csr_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
 import nltk
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 import re
 
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('wordnet')
-nltk.download('punkt_tab')
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _nltk_resources():
+    """
+    Stop words and lemmatizer shared by every IngredientProcessor.
+    
+    Loaded on first use rather than at import, downloading the NLTK data only if
+    it isn't already installed, so importing this module has no side effects.
+    """
+    for resource, path in (('stopwords', 'corpora/stopwords'), ('wordnet', 'corpora/wordnet')):
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(resource, quiet=True)
+    return frozenset(stopwords.words('english')), WordNetLemmatizer()
+
+# Weights applied to each score component when computing total_score
+SCORE_WEIGHTS = {
+    'ingredient_match': 0.4,
+    'time_score': 0.3,
+    'preference_score': 0.3,
+    'exclusion_penalty': -1.0
+}
 
 @dataclass
 class UserPreferences:
@@ -22,15 +46,112 @@ class UserPreferences:
     excluded_ingredients: Optional[List[str]] = None   # Ingredients to avoid
     preferred_ingredients: Optional[List[str]] = None  # Ingredients they particularly like
 
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row in place, leaving all-zero rows as zeros"""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+def _gather_postings(postings: csc_matrix, columns) -> np.ndarray:
+    """Row indices stored under the given columns of a CSC matrix, concatenated"""
+    return np.concatenate(
+        [postings.indices[postings.indptr[c]:postings.indptr[c + 1]] for c in columns]
+        or [np.zeros(0, dtype=postings.indices.dtype)]
+    )
+
+# Token -> WordNet lemma. Ingredient vocabularies are tiny, so after the catalogue
+# is fitted nearly every token is a plain dict hit; new query tokens are added
+# up to LEMMA_MAP_SIZE
+LEMMA_MAP_SIZE = 50_000
+_LEMMA_MAP: Dict[str, str] = {}
+
+def _lemmatize(lemmatizer: WordNetLemmatizer, token: str) -> str:
+    """WordNet lemmatization for a token missing from _LEMMA_MAP"""
+    lemma = lemmatizer.lemmatize(token)
+    if len(_LEMMA_MAP) < LEMMA_MAP_SIZE:
+        _LEMMA_MAP[token] = lemma
+    return lemma
+
+# Quantities with common unit words, parenthetical text and prep instructions
+# are all stripped, so they share one alternation and a single pass
+_UNIT_RE = re.compile(r'\d+\/?\d*\s*(?:cup|tablespoon|teaspoon|pound|ounce|oz|lb|g|kg|ml|c|tbsp|tsp|cups|tablespoons|teaspoons|pounds|ounces)s?\b')
+_PAREN_RE = re.compile(r'\([^)]*\)')
+_PREP_RE = re.compile(r'\b(?:chopped|diced|minced|sliced|grated|for serving|to serve|optional|to taste)\b')
+_ALL_JUNK_RE = re.compile('|'.join(p.pattern for p in (_UNIT_RE, _PAREN_RE, _PREP_RE)))
+
+# Ingredient names don't need full Penn Treebank tokenization; runs of letters
+# and digits (Unicode included, as str.isalnum) are enough
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+def _preprocess_ingredient(text: str, lemmatizer: WordNetLemmatizer, stop_words: FrozenSet[str]) -> str:
+    """Clean and normalize ingredient text"""
+    cleaned = _ALL_JUNK_RE.sub('', text.lower())
+    
+    # Remove stopwords and lemmatize
+    tokens = [
+        _LEMMA_MAP.get(token) or _lemmatize(lemmatizer, token)
+        for token in _TOKEN_RE.findall(cleaned)
+        if token not in stop_words
+    ]
+    
+    return ' '.join(tokens)
+
+# Processed catalogue ingredient strings persisted across runs; bump the version
+# whenever _preprocess_ingredient changes what it produces
+PREPROC_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'recipes', f'ing_preproc_v2_nltk{nltk.__version__}.json'
+)
+
+# Query-time strings come from users, so they are memoized in process only
+PREPROC_QUERY_CACHE_SIZE = 10_000
+_preprocess_query = lru_cache(maxsize=PREPROC_QUERY_CACHE_SIZE)(_preprocess_ingredient)
+
+_PREPROC_CACHE: Optional[Dict[str, str]] = None
+_preproc_cache_dirty = False
+
+def _load_preproc_cache() -> Dict[str, str]:
+    """Load the processed-ingredient cache on first use and save it again at exit"""
+    global _PREPROC_CACHE
+    if _PREPROC_CACHE is None:
+        try:
+            with open(PREPROC_CACHE_PATH, encoding='utf-8') as f:
+                _PREPROC_CACHE = json.load(f)
+        except FileNotFoundError:
+            _PREPROC_CACHE = {}
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable ingredient cache %s", PREPROC_CACHE_PATH, exc_info=True)
+            _PREPROC_CACHE = {}
+        atexit.register(_save_preproc_cache)
+    return _PREPROC_CACHE
+
+def _replace_preproc_cache(processed: Dict[str, str]):
+    """Make the persisted cache hold exactly the latest fitted catalogue"""
+    global _PREPROC_CACHE, _preproc_cache_dirty
+    if processed != _load_preproc_cache():
+        _PREPROC_CACHE = processed
+        _preproc_cache_dirty = True
+
+def _save_preproc_cache():
+    """Write the processed-ingredient cache back if anything new was processed"""
+    if not _preproc_cache_dirty:
+        return
+    try:
+        os.makedirs(os.path.dirname(PREPROC_CACHE_PATH), exist_ok=True)
+        tmp_path = f'{PREPROC_CACHE_PATH}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_PREPROC_CACHE, f)
+        os.replace(tmp_path, PREPROC_CACHE_PATH)
+    except OSError:
+        logger.warning("Could not save ingredient cache %s", PREPROC_CACHE_PATH, exc_info=True)
+
 class IngredientProcessor:
     """Handles ingredient text processing and similarity matching"""
     
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
+        self.stop_words, self.lemmatizer = _nltk_resources()
         self.vectorizer = TfidfVectorizer(
             analyzer='word',
-            ngram_range=(1, 2),  # Use both unigrams and bigrams
+            ngram_range=(1, 1),  # Bigrams of 2-4 word names mostly inflate the vocabulary
             min_df=1
         )
         self.ingredient_vectors = None
@@ -38,35 +159,19 @@ class IngredientProcessor:
 
     def preprocess_ingredient(self, text: str) -> str:
         """Clean and normalize ingredient text"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove quantities and common unit words
-        units = r'\d+\/?\d*\s*(?:cup|tablespoon|teaspoon|pound|ounce|oz|lb|g|kg|ml|c|tbsp|tsp|cups|tablespoons|teaspoons|pounds|ounces)s?\b'
-        text = re.sub(units, '', text)
-        
-        # Remove parenthetical text
-        text = re.sub(r'\([^)]*\)', '', text)
-        
-        # Remove common prep instructions
-        prep_words = r'\b(?:chopped|diced|minced|sliced|grated|for serving|to serve|optional|to taste)\b'
-        text = re.sub(prep_words, '', text)
-        
-        # Tokenize
-        tokens = word_tokenize(text)
-        
-        # Remove stopwords and lemmatize
-        tokens = [
-            self.lemmatizer.lemmatize(token)
-            for token in tokens
-            if token.isalnum() and token not in self.stop_words
-        ]
-        
-        return ' '.join(tokens)
+        processed = _load_preproc_cache().get(text)
+        if processed is None:
+            processed = _preprocess_query(text, self.lemmatizer, self.stop_words)
+        return processed
 
     def fit_transform_ingredients(self, ingredients: List[str]):
         """Process and vectorize a list of ingredients"""
-        self.processed_ingredients = [self.preprocess_ingredient(ing) for ing in ingredients]
+        cache = _load_preproc_cache()
+        self.processed_ingredients = [
+            cache[ing] if ing in cache else _preprocess_ingredient(ing, self.lemmatizer, self.stop_words)
+            for ing in ingredients
+        ]
+        _replace_preproc_cache(dict(zip(ingredients, self.processed_ingredients)))
         self.ingredient_vectors = self.vectorizer.fit_transform(self.processed_ingredients)
         
     def transform_ingredients(self, ingredients: List[str]):
@@ -74,116 +179,173 @@ class IngredientProcessor:
         processed = [self.preprocess_ingredient(ing) for ing in ingredients]
         return self.vectorizer.transform(processed)
 
+    def similarity_matrix(self, queries: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of every query to every fitted ingredient.
+        
+        Returns:
+            np.ndarray: Shape (len(queries), n_ingredients)
+        """
+        # Rows are L2-normalized and hold only a few terms each, so the sparse
+        # product is both the cosine similarity and the cheapest way to get it
+        return (self.transform_ingredients(queries) @ self.ingredient_vectors.T).toarray()
+
     def find_similar_ingredients(self, query: str, threshold: float = 0.3) -> List[tuple]:
         """Find similar ingredients above similarity threshold"""
-        processed_query = self.preprocess_ingredient(query)
-        query_vector = self.vectorizer.transform([processed_query])
-        
-        # Calculate cosine similarity
-        similarities = (self.ingredient_vectors @ query_vector.T).toarray().flatten()
-        
-        # Get ingredients above threshold
-        similar = [
-            (self.processed_ingredients[i], similarities[i])
-            for i in range(len(similarities))
-            if similarities[i] > threshold
-        ]
+        return self.find_similar_ingredients_batch([query], threshold)[0]
+
+    def find_similar_ingredients_batch(self, queries: List[str], threshold: float = 0.3) -> List[List[tuple]]:
+        """
+        Find similar ingredients for several queries with one transform and one product.
         
-        return sorted(similar, key=lambda x: x[1], reverse=True)
+        Returns:
+            List[List[tuple]]: Per query, (ingredient, similarity) pairs above threshold, best first
+        """
+        results = []
+        if not queries:
+            return results
+        for similarities in self.similarity_matrix(queries):
+            above = np.flatnonzero(similarities > threshold)
+            above = above[np.argsort(-similarities[above], kind='stable')]
+            results.append([(self.processed_ingredients[i], similarities[i]) for i in above])
+        return results
 
 class EnhancedRecipeRecommender:
     def __init__(self, recipe_repository):
         self.recipe_repository = recipe_repository
         self.ingredient_processor = IngredientProcessor()
-        self.initialize_ingredient_vectors()
+        
+        # Struct-of-arrays view of the recipe catalogue, built once by initialize_ingredient_vectors
+        self.recipes = []
+        self.ingredient_names: List[str] = []        # interned id -> lowercase ingredient name
+        self.ingredient_index: Dict[str, int] = {}   # lowercase ingredient name -> interned id
+        self.recipe_ingredient_ids: List[np.ndarray] = []  # sorted uint32 ids per recipe
+        self.recipe_matrix = csr_matrix((0, 0))      # multi-hot (n_recipes, n_ingredients)
+        self.ingredient_postings = csc_matrix((0, 0))  # same matrix by column: recipes per ingredient
+        self.ingredient_counts = np.zeros(0)         # distinct ingredients per recipe
+        self.total_times = np.zeros(0)               # total minutes, 0 when unknown
+        self.recipe_centroids = np.zeros((0, 0), dtype=np.float32)  # normalized mean TF-IDF per recipe
+        self.term_postings = csc_matrix((0, 0))     # inverted index: TF-IDF term -> recipes using it
     
-    def get_recipe_ingredients(self, recipe) -> Set[str]:
-        """Extract all ingredient names from a recipe."""
-        ingredients = set()
-        for section in recipe.ingredients.values():
-            for ingredient in section:
-                # Convert ingredient name to lowercase for better matching
-                ingredients.add(ingredient.name.lower())
-        return ingredients
-
-    def initialize_ingredient_vectors(self):
-        """Initialize the ingredient processor with all ingredients from the database"""
-        all_recipes = self.recipe_repository.get_recipes(limit=1000)
-        all_ingredients = set()
-        
-        # Collect all unique ingredients
-        for recipe in all_recipes:
-            for section in recipe.ingredients.values():
-                for ingredient in section:
-                    all_ingredients.add(ingredient.name)
-        
-        # Process and vectorize all ingredients
-        self.ingredient_processor.fit_transform_ingredients(list(all_ingredients))
-
-    def calculate_ingredient_similarity(self, user_ingredients: List[str], recipe_ingredients: Set[str]) -> float:
-        """Calculate similarity score between user ingredients and recipe ingredients"""
-        matches = 0
-        total_recipe_ingredients = len(recipe_ingredients)
-        
-        for user_ing in user_ingredients:
-            similar_ingredients = self.ingredient_processor.find_similar_ingredients(user_ing)
+    async def initialize_ingredient_vectors(self):
+        """
+        Load the recipe catalogue once and build the matrices used for scoring.
+        
+        Recipes inserted afterwards are not recommended until this is called again.
+        """
+        self.recipes = await self.recipe_repository.get_recipes(limit=1000)
+        recipe_names = [recipe.ingredient_name_set for recipe in self.recipes]
+        
+        # Intern every distinct lowercase ingredient name to a small integer id
+        self.ingredient_names = sorted(set().union(*recipe_names))
+        self.ingredient_index = {name: i for i, name in enumerate(self.ingredient_names)}
+        self.recipe_ingredient_ids = [
+            np.array(sorted(self.ingredient_index[name] for name in names), dtype=np.uint32)
+            for names in recipe_names
+        ]
+        
+        # The per-recipe id arrays double as the CSR structure of the recipe matrix
+        self.ingredient_counts = np.array([len(ids) for ids in self.recipe_ingredient_ids], dtype=np.int64)
+        indptr = np.concatenate(([0], np.cumsum(self.ingredient_counts)))
+        indices = np.concatenate(self.recipe_ingredient_ids) if self.recipes else np.zeros(0, dtype=np.uint32)
+        self.recipe_matrix = csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(self.recipes), len(self.ingredient_names))
+        )
+        self.ingredient_postings = self.recipe_matrix.tocsc()
+        self.total_times = np.array([recipe.total_time or 0 for recipe in self.recipes], dtype=np.float64)
+        
+        # Process and vectorize all ingredients; TF-IDF row i belongs to ingredient id i
+        self.ingredient_processor.fit_transform_ingredients(self.ingredient_names)
+        
+        # Summing a recipe's normalized ingredient rows and renormalizing gives its centroid
+        centroid_sums = self.recipe_matrix @ self.ingredient_processor.ingredient_vectors
+        self.recipe_centroids = _normalize_rows(centroid_sums.toarray().astype(np.float32))
+        self.term_postings = centroid_sums.tocsc()
+
+    def count_recipe_matches(self, *name_lists: Optional[List[str]]) -> np.ndarray:
+        """
+        Count, for every recipe, how many names of each list it contains.
+        
+        Each name's recipes are a contiguous slice of the column-major postings, so
+        the work is proportional to the postings of the queried names only.
+        
+        Returns:
+            np.ndarray: Shape (n_recipes, len(name_lists)), one column per list
+        """
+        postings = self.ingredient_postings
+        counts = np.zeros((len(self.recipes), len(name_lists)))
+        for j, names in enumerate(name_lists):
+            columns = [
+                self.ingredient_index[name]
+                for name in set(ing.lower() for ing in names or [])
+                if name in self.ingredient_index
+            ]
+            if columns:
+                counts[:, j] = np.bincount(_gather_postings(postings, columns), minlength=len(self.recipes))
+        return counts
+
+    def calculate_ingredient_scores(self, user_ingredients: List[str]) -> np.ndarray:
+        """
+        Score every recipe by the cosine between its ingredient centroid and the user's.
+        
+        Both centroids are normalized, so this is a matrix-vector product. Only
+        recipes sharing a term with the user's centroid can score above 0, so the
+        product is restricted to them when they are a minority of the catalogue.
+        
+        Args:
+            user_ingredients: Ingredients the user has
             
-            # Check if any similar ingredients are in the recipe
-            for recipe_ing in recipe_ingredients:
-                recipe_similar = self.ingredient_processor.find_similar_ingredients(recipe_ing)
-                
-                # If any similar ingredients match with high similarity, count it
-                if any(sim[1] > 0.5 for sim in similar_ingredients):
-                    matches += 1
-                    break
-        
-        return matches / total_recipe_ingredients if total_recipe_ingredients > 0 else 0.0
-
-    def calculate_recipe_score(self, recipe, preferences: UserPreferences, ingredient_score: float) -> Dict:
-        """Calculate overall recipe score based on various factors"""
+        Returns:
+            np.ndarray: Ingredient score per recipe
+        """
+        query_vectors = self.ingredient_processor.transform_ingredients(user_ingredients)
+        query_centroid = _normalize_rows(np.asarray(query_vectors.sum(axis=0), dtype=np.float32).ravel())
+        
+        candidates = np.unique(_gather_postings(self.term_postings, np.flatnonzero(query_centroid)))
+        if 2 * len(candidates) >= len(self.recipes):
+            return self.recipe_centroids @ query_centroid
+        scores = np.zeros(len(self.recipes), dtype=np.float32)
+        scores[candidates] = self.recipe_centroids[candidates] @ query_centroid
+        return scores
+
+    def score_recipes(self, preferences: UserPreferences) -> Dict[str, np.ndarray]:
+        """Calculate every score component for all recipes at once"""
+        n_recipes = len(self.recipes)
         scores = {
-            'ingredient_match': ingredient_score,
-            'time_score': 0.0,
-            'preference_score': 0.0,
-            'exclusion_penalty': 0.0,
-            'total_score': 0.0
+            'ingredient_match': np.zeros(n_recipes),
+            'time_score': np.zeros(n_recipes),
+            'preference_score': np.zeros(n_recipes),
+            'exclusion_penalty': np.zeros(n_recipes),
         }
         
-        # Time score
-        if preferences.max_time and recipe.total_time:
-            if recipe.total_time <= preferences.max_time:
-                scores['time_score'] = 1.0
-            else:
-                time_diff = recipe.total_time - preferences.max_time
-                scores['time_score'] = max(0, 1 - (time_diff / preferences.max_time))
-        
-        # Preference score
-        if preferences.preferred_ingredients:
-            recipe_ingredients = self.get_recipe_ingredients(recipe)
-            preferred = set(ing.lower() for ing in preferences.preferred_ingredients)
-            matches = recipe_ingredients.intersection(preferred)
-            scores['preference_score'] = len(matches) / len(preferred) if preferred else 0
-        
-        # Exclusion penalty
-        if preferences.excluded_ingredients:
-            recipe_ingredients = self.get_recipe_ingredients(recipe)
-            excluded = set(ing.lower() for ing in preferences.excluded_ingredients)
-            matches = recipe_ingredients.intersection(excluded)
-            scores['exclusion_penalty'] = len(matches)
+        # Ingredient score: closeness of the user's ingredients to the recipe's as a whole
+        if preferences.available_ingredients:
+            scores['ingredient_match'] = self.calculate_ingredient_scores(preferences.available_ingredients)
         
-        # Calculate total score with weights
-        weights = {
-            'ingredient_match': 0.4,
-            'time_score': 0.3,
-            'preference_score': 0.3,
-            'exclusion_penalty': -1.0
-        }
+        # Time score; recipes without a known total time score 0
+        if preferences.max_time:
+            overrun = (self.total_times - preferences.max_time) / preferences.max_time
+            scores['time_score'] = np.where(
+                self.total_times > 0,
+                np.maximum(0, 1 - np.maximum(overrun, 0)),
+                0.0
+            )
+        
+        # Preference score and exclusion penalty, counted in one pass over the recipe matrix
+        if preferences.preferred_ingredients or preferences.excluded_ingredients:
+            preferred_counts, excluded_counts = self.count_recipe_matches(
+                preferences.preferred_ingredients,
+                preferences.excluded_ingredients
+            ).T
+            if preferences.preferred_ingredients:
+                preferred = set(ing.lower() for ing in preferences.preferred_ingredients)
+                scores['preference_score'] = preferred_counts / len(preferred)
+            scores['exclusion_penalty'] = excluded_counts
         
-        scores['total_score'] = (
-            scores['ingredient_match'] * weights['ingredient_match'] +
-            scores['time_score'] * weights['time_score'] +
-            scores['preference_score'] * weights['preference_score'] +
-            scores['exclusion_penalty'] * weights['exclusion_penalty']
+        # Calculate total score with weights
+        scores['total_score'] = sum(
+            scores[component] * weight for component, weight in SCORE_WEIGHTS.items()
         )
         
         return scores
@@ -194,43 +356,58 @@ class EnhancedRecipeRecommender:
         num_recommendations: int = 5
     ) -> List[Dict]:
         """Get recommendations with enhanced ingredient matching"""
-        all_recipes = self.recipe_repository.get_recipes(limit=1000)
-        scored_recipes = []
+        user_ingredients = preferences.available_ingredients or []
+        scores = self.score_recipes(preferences)
+        total_scores = scores['total_score']
         
-        for recipe in all_recipes:
-            recipe_ingredients = self.get_recipe_ingredients(recipe)
-            
-            # Calculate ingredient similarity using NLP
-            ingredient_score = self.calculate_ingredient_similarity(
-                preferences.available_ingredients,
-                recipe_ingredients
-            ) if preferences.available_ingredients else 0.0
-            
-            # Calculate overall score
-            scores = self.calculate_recipe_score(recipe, preferences, ingredient_score)
-            
-            if scores['total_score'] > 0:
-                scored_recipes.append({
-                    'recipe': recipe,
-                    'scores': scores,
-                    'matching_ingredients': self.get_matching_ingredients(
-                        preferences.available_ingredients or [],
-                        recipe_ingredients
-                    )
-                })
-        
-        scored_recipes.sort(key=lambda x: x['scores']['total_score'], reverse=True)
-        return scored_recipes[:num_recommendations]
-
-    def get_matching_ingredients(self, user_ingredients: List[str], recipe_ingredients: Set[str]) -> Dict[str, List[str]]:
+        # Partition out the k-th best positive score, keep everything above it and
+        # fill the remaining slots with the earliest recipes tied at it, so ties
+        # are broken by catalogue order as a stable sort would
+        ranked = np.flatnonzero(total_scores > 0)
+        if num_recommendations <= 0:
+            ranked = ranked[:0]
+        elif len(ranked) > num_recommendations:
+            positive = total_scores[ranked]
+            kth = np.partition(-positive, num_recommendations - 1)[num_recommendations - 1]
+            above = ranked[-positive < kth]
+            tied = ranked[-positive == kth][:num_recommendations - len(above)]
+            ranked = np.concatenate((above, tied))
+        ranked = ranked[np.lexsort((ranked, -total_scores[ranked]))]
+        
+        # Per-ingredient similarities are only needed to explain the returned recipes
+        similarities = (
+            self.ingredient_processor.similarity_matrix(user_ingredients)
+            if user_ingredients and len(ranked) else np.zeros((0, len(self.ingredient_names)))
+        )
+        
+        recommendations = []
+        for i in ranked:
+            recipe = self.recipes[i]
+            recommendations.append({
+                'recipe': recipe,
+                'scores': {component: float(values[i]) for component, values in scores.items()},
+                'matching_ingredients': self.get_matching_ingredients(
+                    user_ingredients,
+                    similarities,
+                    self.recipe_ingredient_ids[i]
+                )
+            })
+        return recommendations
+
+    def get_matching_ingredients(
+        self,
+        user_ingredients: List[str],
+        similarities: np.ndarray,
+        recipe_ingredient_ids: np.ndarray
+    ) -> Dict[str, List[str]]:
         """Get detailed ingredient matches for explanation"""
         matches = {}
-        for user_ing in user_ingredients:
-            similar = []
-            for recipe_ing in recipe_ingredients:
-                similarity = self.ingredient_processor.find_similar_ingredients(recipe_ing)
-                if similarity and similarity[0][1] > 0.3:
-                    similar.append(recipe_ing)
+        for user_ing, user_similarities in zip(user_ingredients, similarities):
+            similar = [
+                self.ingredient_names[ingredient_id]
+                for ingredient_id in recipe_ingredient_ids
+                if user_similarities[ingredient_id] > 0.3
+            ]
             if similar:
                 matches[user_ing] = similar
         return matches
\ No newline at end of file
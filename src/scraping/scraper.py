@@ -1,15 +1,63 @@
+import asyncio
 import requests
-import time
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Optional
 from bs4 import BeautifulSoup
+from src.config.db_connection import init_pool
 from src.database.queries import RecipeRepository
 from src.models.recipe import Recipe
 from src.models.ingredient import Ingredient
 
+REQUEST_TIMEOUT = 10  # seconds
+
+# Scraped recipes are written to the database in batches of this size
+INSERT_BATCH_SIZE = 25
+
+# One keep-alive connection pool shared by every fetch, including the worker threads
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+)
+SESSION.mount('https://', _ADAPTER)
+SESSION.mount('http://', _ADAPTER)
+
+_DIGITS_RE = re.compile(r'\d+')
+
+_INGREDIENT_SELECTOR = (
+    'p.mm-recipes-structured-ingredients__list-heading, '
+    'li.mm-recipes-structured-ingredients__list-item'
+)
+_INGREDIENT_SPAN_ATTRS = (
+    ('quantity', 'data-ingredient-quantity'),
+    ('unit', 'data-ingredient-unit'),
+    ('name', 'data-ingredient-name'),
+)
+
+class _RateLimiter:
+    """Spaces request starts at least `interval` seconds apart across all workers"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+                now = self._next_start
+            self._next_start = now + self.interval
+
 def get_recipe_links(url):
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    soup = BeautifulSoup(response.content, 'lxml')
     
     recipe_cards = soup.select('a.comp.mntl-card-list-items.mntl-universal-card.mntl-document-card.mntl-card.card.card--no-image')
     
@@ -21,10 +69,13 @@ def get_recipe_links(url):
     
     return recipe_links
 
+@lru_cache(maxsize=1024)
 def convert_to_minutes(time_str: str) -> Optional[int]:
     """
     Convert time string to minutes, returning None for invalid/not found values.
     
+    Memoized, since the same few time strings repeat across most recipes.
+    
     Args:
         time_str: String representation of time (e.g., "45 minutes", "1 hour", "Not Found")
         
@@ -37,27 +88,21 @@ def convert_to_minutes(time_str: str) -> Optional[int]:
     # Remove any extra whitespace and convert to lowercase
     time_str = time_str.strip().lower()
     
-    try:
-        # Handle hours
-        if 'hour' in time_str or 'hr' in time_str:
-            hours = int(re.findall(r'\d+', time_str)[0])
-            return hours * 60
-        # Handle minutes
-        elif 'min' in time_str:
-            return int(re.findall(r'\d+', time_str)[0])
-        # Handle bare numbers (assume minutes)
-        elif re.findall(r'\d+', time_str):
-            return int(re.findall(r'\d+', time_str)[0])
-    except (IndexError, ValueError):
+    match = _DIGITS_RE.search(time_str)
+    if not match:
         return None
-        
-    return None
+    
+    # Hours are converted; minutes and bare numbers are taken as minutes
+    value = int(match.group())
+    if 'hour' in time_str or 'hr' in time_str:
+        return value * 60
+    return value
 
 
 
 def scrape_recipe(url):
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+    response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    soup = BeautifulSoup(response.content, 'lxml')
 
     # get name of recipe
     title_element = soup.find('h1', class_='article-heading text-headline-400')
@@ -94,19 +139,21 @@ def scrape_recipe(url):
     if ingredient_items:
         current_category = 'main'
         ingredients[current_category] = []
-        for item in ingredient_items.find_all(['p', 'li']):
-            if item.name == 'p' and 'mm-recipes-structured-ingredients__list-heading' in item.get('class', []):
+        # Headings and items come back from one selector pass, in document order
+        for item in ingredient_items.select(_INGREDIENT_SELECTOR):
+            if item.name == 'p':
                 current_category = item.text.strip()
                 ingredients[current_category] = []
-            elif item.name == 'li' and 'mm-recipes-structured-ingredients__list-item' in item.get('class', []):
-                quantity = item.find('span', attrs={'data-ingredient-quantity': 'true'})
-                quantity = quantity.text.strip() if quantity else ''
-                
-                unit = item.find('span', attrs={'data-ingredient-unit': 'true'})
-                unit = unit.text.strip() if unit else ''
-                
-                name = item.find('span', attrs={'data-ingredient-name': 'true'})
-                name = name.text.strip() if name else ''
+            else:
+                # One walk over the item's spans picks up quantity, unit and name
+                fields = {}
+                for span in item.find_all('span'):
+                    for field, attr in _INGREDIENT_SPAN_ATTRS:
+                        if field not in fields and span.get(attr) == 'true':
+                            fields[field] = span.text.strip()
+                quantity = fields.get('quantity', '')
+                unit = fields.get('unit', '')
+                name = fields.get('name', '')
                 
                 additional = item.p.text.strip()
                 additional = ' '.join(additional.split()[len(quantity.split()) + len(unit.split()) + len(name.split()):])
@@ -131,18 +178,23 @@ def scrape_recipe(url):
         'servings': servings
     }
 
-def scrape_and_store_recipes(
+async def scrape_and_store_recipes(
     start_url: str = 'https://www.allrecipes.com/recipes/16492/everyday-cooking/special-collections/allrecipes-allstars/',
     num_recipes: int = 50,
-    delay: float = 1.0
+    delay: float = 1.0,
+    max_workers: int = 8
 ) -> List[str]:
     """
     Scrape recipes from AllRecipes and store them in the database.
     
+    Recipes are fetched concurrently on a thread pool, while request starts
+    are still kept at least `delay` seconds apart.
+    
     Args:
         start_url (str): The starting URL to scrape recipes from
         num_recipes (int): Maximum number of recipes to scrape
-        delay (float): Delay between requests in seconds
+        delay (float): Minimum delay between request starts in seconds
+        max_workers (int): Maximum number of recipes fetched at once
         
     Returns:
         List[str]: List of processed recipe titles
@@ -150,7 +202,8 @@ def scrape_and_store_recipes(
     print(f"Starting recipe scraping process. Target: {num_recipes} recipes")
     
     # Initialize repository
-    repo = RecipeRepository()
+    pool = await init_pool(min_size=1, max_size=2)
+    repo = RecipeRepository(pool)
     processed_recipes = []
     errors = []
     
@@ -165,38 +218,58 @@ def scrape_and_store_recipes(
             
         print(f"Found {len(links)} recipe links")
         
-        # Process each link up to num_recipes
-        for i, link in enumerate(links[:num_recipes]):
-            try:
-                print(f"\nProcessing recipe {i+1}/{num_recipes}: {link}")
-                
-                # Scrape the recipe
-                recipe_data = scrape_recipe(link)
-                if not recipe_data:
-                    print(f"Failed to scrape recipe from {link}")
-                    continue
-                
-                # Insert into database
-                recipe_id = repo.insert_recipe(recipe_data)
+        loop = asyncio.get_running_loop()
+        limiter = _RateLimiter(delay)
+        in_flight = asyncio.Semaphore(max_workers)
+        pending: List[dict] = []
+        
+        async def flush(batch: List[dict]):
+            recipe_ids = await repo.insert_recipes_bulk(batch)
+            if recipe_ids is None:
+                # Retry one by one so a single bad recipe doesn't lose the whole batch
+                recipe_ids = [await repo.insert_recipe(recipe_data) for recipe_data in batch]
+            for recipe_data, recipe_id in zip(batch, recipe_ids):
                 if recipe_id:
                     processed_recipes.append(recipe_data['title'])
                     print(f"Successfully stored recipe: {recipe_data['title']}")
                 else:
                     print(f"Failed to store recipe: {recipe_data['title']}")
+        
+        async def process(i: int, link: str):
+            try:
+                # Scrape the recipe, respecting the website by spacing out requests
+                async with in_flight:
+                    await limiter.wait()
+                    print(f"\nProcessing recipe {i+1}/{num_recipes}: {link}")
+                    recipe_data = await loop.run_in_executor(executor, scrape_recipe, link)
+                if not recipe_data:
+                    print(f"Failed to scrape recipe from {link}")
+                    return
                 
-                # Respect the website by waiting between requests
-                time.sleep(delay)
+                # Queue for the database, writing a batch once enough have piled up
+                pending.append(recipe_data)
+                if len(pending) >= INSERT_BATCH_SIZE:
+                    batch = pending[:]
+                    pending.clear()
+                    await flush(batch)
                 
             except Exception as e:
                 error_msg = f"Error processing {link}: {str(e)}"
                 print(error_msg)
                 errors.append(error_msg)
-                continue
+        
+        # Process each link up to num_recipes
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            await asyncio.gather(*(process(i, link) for i, link in enumerate(links[:num_recipes])))
+        if pending:
+            await flush(pending)
         
     except Exception as e:
         print(f"Fatal error in scraping process: {str(e)}")
         
     finally:
+        await pool.close()
+        
         # Print summary
         print("\n=== Scraping Summary ===")
         print(f"Total recipes processed: {len(processed_recipes)}")
@@ -212,10 +285,10 @@ def scrape_and_store_recipes(
 
 if __name__ == "__main__":
     # Example usage:
-    processed_recipes = scrape_and_store_recipes(
+    processed_recipes = asyncio.run(scrape_and_store_recipes(
         num_recipes=100,  # Start with a small number for testing
         delay=0.5  # Be nice to the website
-    )
+    ))
     
     print("\nProcessed Recipes:")
     for title in processed_recipes: